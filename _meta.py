@@ -0,0 +1,4 @@
+
+release = "UNKNOWN"
+version = "UNKNOWN"
+
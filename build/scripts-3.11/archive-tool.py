@@ -0,0 +1,5 @@
+#!/root/.pyenv/versions/3.11.7/bin/python
+
+import archive.cli
+
+archive.cli.archive_tool()
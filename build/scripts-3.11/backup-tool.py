@@ -0,0 +1,8 @@
+#!/root/.pyenv/versions/3.11.7/bin/python
+"""Create a backup.
+"""
+
+import sys
+import archive.bt
+
+sys.exit(archive.bt.backup_tool())
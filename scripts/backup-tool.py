@@ -2,6 +2,7 @@
 """Create a backup.
 """
 
+import sys
 import archive.bt
 
-archive.bt.backup_tool()
+sys.exit(archive.bt.backup_tool())
@@ -118,6 +118,9 @@ class Archive:
 
     def _create(self, mode):
         with tarfile.open(self.path, mode, format=tarfile.PAX_FORMAT) as tarf:
+            # Copy file content in larger chunks than the tarfile
+            # default of 16 KiB.  Python < 3.8 ignores the attribute.
+            tarf.copybufsize = 1 << 20
             with tempfile.TemporaryFile() as tmpf:
                 self.manifest.write(tmpf)
                 tmpf.seek(0)
@@ -287,21 +290,29 @@ class Archive:
             if ti.name != md:
                 raise ArchiveIntegrityError("metadata item '%s' not found"
                                             % md)
-        # Check the content of the archive.
-        for fileinfo in self.manifest:
-            self._verify_item(fileinfo)
+        # Check the content of the archive.  Walk through the
+        # remaining items of the tarfile only once in their order,
+        # rather than looking up each item from the manifest.  This
+        # avoids seeking back and forth in compressed archives.
+        fileinfos = { self._arcname(fi.path): fi for fi in self.manifest }
+        for tarinfo in tarf_it:
+            try:
+                fileinfo = fileinfos.pop(tarinfo.name)
+            except KeyError:
+                continue
+            self._verify_item(fileinfo, tarinfo)
+        if fileinfos:
+            fileinfo = next(iter(fileinfos.values()))
+            raise ArchiveIntegrityError("%s:%s: missing"
+                                        % (self.path, fileinfo.path))
 
-    def _verify_item(self, fileinfo):
+    def _verify_item(self, fileinfo, tarinfo):
 
         def _check_condition(cond, item, message):
             if not cond:
                 raise ArchiveIntegrityError("%s: %s" % (item, message))
 
         itemname = "%s:%s" % (self.path, fileinfo.path)
-        try:
-            tarinfo = self._file.getmember(self._arcname(fileinfo.path))
-        except KeyError:
-            raise ArchiveIntegrityError("%s: missing" % itemname)
         _check_condition(tarinfo.mode == fileinfo.mode,
                          itemname, "wrong mode")
         _check_condition(int(tarinfo.mtime) == int(fileinfo.mtime),
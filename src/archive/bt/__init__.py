@@ -11,7 +11,10 @@ from archive.bt.config import Config
 log = logging.getLogger(__name__)
 subcmds = ( "create", "index", )
 
-def backup_tool():
+def backup_tool(argv=None):
+    """Run backup-tool with the command line arguments argv.
+    Return the exit status.
+    """
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     argparser = argparse.ArgumentParser()
@@ -21,7 +24,7 @@ def backup_tool():
     for sc in subcmds:
         m = importlib.import_module('archive.bt.%s' % sc)
         m.add_parser(subparsers)
-    args = argparser.parse_args()
+    args = argparser.parse_args(argv)
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -33,7 +36,7 @@ def backup_tool():
     except ConfigError as e:
         print("%s: configuration error: %s" % (argparser.prog, e),
               file=sys.stderr)
-        sys.exit(2)
+        return 2
 
     if config.policy:
         log.info("%s %s: host:%s, policy:%s", argparser.prog, args.subcmd,
@@ -42,8 +45,8 @@ def backup_tool():
         log.info("%s %s: host:%s", argparser.prog, args.subcmd, config.host)
 
     try:
-        sys.exit(args.func(args, config))
+        return args.func(args, config)
     except ArchiveError as e:
         print("%s: error: %s" % (argparser.prog, e),
               file=sys.stderr)
-        sys.exit(1)
+        return 1
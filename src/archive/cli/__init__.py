@@ -9,7 +9,7 @@ from archive.exception import *
 
 subcmds = [ "create", "verify", "ls", "info", "check", "diff", "find", ]
 
-argparser = argparse.ArgumentParser()
+argparser = None
 
 def showwarning(message, category, filename, lineno, file=None, line=None):
     """Display ArchiveWarning in a somewhat more user friendly manner.
@@ -33,6 +33,8 @@ def showwarning(message, category, filename, lineno, file=None, line=None):
         pass # the file (probably stderr) is invalid - this warning gets lost.
 
 def archive_tool():
+    global argparser
+    argparser = argparse.ArgumentParser()
     warnings.showwarning = showwarning
     subparsers = argparser.add_subparsers(title='subcommands', dest='subcmd')
     for sc in subcmds:
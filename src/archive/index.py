@@ -3,9 +3,8 @@
 
 from collections.abc import Mapping, Sequence
 from pathlib import Path
-import yaml
 from .archive import Archive
-from .tools import Version, parse_date
+from .tools import Version, parse_date, yaml_dump, yaml_load_all
 
 
 class IndexItem:
@@ -85,7 +84,7 @@ class ArchiveIndex(Sequence):
 
     def __init__(self, fileobj=None):
         if fileobj is not None:
-            docs = yaml.safe_load_all(fileobj)
+            docs = yaml_load_all(fileobj)
             self.head = next(docs)
             self.items = [ IndexItem(data=d) for d in next(docs) ]
         else:
@@ -116,11 +115,8 @@ class ArchiveIndex(Sequence):
 
     def write(self, fileobj):
         fileobj.write("%YAML 1.1\n".encode("ascii"))
-        yaml.dump(self.head, stream=fileobj, encoding="ascii",
-                  default_flow_style=False, explicit_start=True)
-        yaml.dump([ i.as_dict() for i in self ],
-                  stream=fileobj, encoding="ascii",
-                  default_flow_style=False, explicit_start=True)
+        yaml_dump(self.head, fileobj)
+        yaml_dump([ i.as_dict() for i in self ], fileobj)
 
     def add_archives(self, paths, prune=False):
         seen = set()
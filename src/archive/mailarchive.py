@@ -1,10 +1,12 @@
+from email.parser import BytesHeaderParser
 import hashlib
 from mailbox import Maildir
 from pathlib import Path
 from tempfile import TemporaryDirectory, TemporaryFile
 import yaml
 from .archive import Archive
-from .tools import Version, now_str, parse_date, tmp_chdir, tmp_umask
+from .tools import (Version, now_str, parse_date, tmp_chdir, tmp_umask,
+                    yaml_load_all)
 
 
 class MailIndex(list):
@@ -13,7 +15,7 @@ class MailIndex(list):
 
     def __init__(self, fileobj=None, items=None, server=None):
         if fileobj:
-            docs = yaml.safe_load_all(fileobj)
+            docs = yaml_load_all(fileobj)
             try:
                 head = next(docs)
                 items = next(docs)
@@ -59,6 +61,7 @@ class MailArchive(Archive):
                 basedir = Path(path.name.split('.')[0])
                 maildir = Maildir(basedir, create=True)
                 self.mailindex = MailIndex(server=server)
+                parser = BytesHeaderParser()
                 last_folder = None
                 for folder, msgbytes in mails:
                     if folder != last_folder:
@@ -66,7 +69,7 @@ class MailArchive(Archive):
                         last_folder = folder
                     sha256 = hashlib.sha256(msgbytes).hexdigest()
                     key = mailfolder.add(msgbytes)
-                    msg = mailfolder.get_message(key)
+                    msg = parser.parsebytes(msgbytes)
                     idx_item = {
                         "Date": msg.get("Date"),
                         "From": msg.get("From"),
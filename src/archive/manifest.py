@@ -11,10 +11,10 @@ from pathlib import Path
 import pwd
 import stat
 import warnings
-import yaml
 import archive
 from .exception import ArchiveInvalidTypeError, ArchiveWarning
-from .tools import Version, now_str, parse_date, checksum, mode_ft, ft_mode
+from .tools import (Version, now_str, parse_date, checksum, mode_ft, ft_mode,
+                    yaml_dump, yaml_load_all)
 
 
 class DiffStatus(Enum):
@@ -31,11 +31,34 @@ class DiffStatus(Enum):
     MISSING_B = 6
 
 
+def _getuname(uid, namecache):
+    """Return the name of the user having uid or None if not found.
+    """
+    key = ("u", uid)
+    if key not in namecache:
+        try:
+            namecache[key] = pwd.getpwuid(uid)[0]
+        except KeyError:
+            namecache[key] = None
+    return namecache[key]
+
+def _getgname(gid, namecache):
+    """Return the name of the group having gid or None if not found.
+    """
+    key = ("g", gid)
+    if key not in namecache:
+        try:
+            namecache[key] = grp.getgrgid(gid)[0]
+        except KeyError:
+            namecache[key] = None
+    return namecache[key]
+
+
 class FileInfo:
 
     Checksums = ['sha256']
 
-    def __init__(self, data=None, path=None):
+    def __init__(self, data=None, path=None, namecache=None):
         if data is not None:
             self.path = Path(data['path'])
             self.uid = data['uid']
@@ -50,18 +73,14 @@ class FileInfo:
             elif self.is_symlink():
                 self.target = Path(data['target'])
         elif path is not None:
+            if namecache is None:
+                namecache = {}
             self.path = path
             fstat = self.path.lstat()
             self.uid = fstat.st_uid
-            try:
-                self.uname = pwd.getpwuid(self.uid)[0]
-            except KeyError:
-                self.uname = None
+            self.uname = _getuname(self.uid, namecache)
             self.gid = fstat.st_gid
-            try:
-                self.gname = grp.getgrgid(self.gid)[0]
-            except KeyError:
-                self.gname = None
+            self.gname = _getgname(self.gid, namecache)
             self.st_mode = fstat.st_mode
             self.mtime = fstat.st_mtime
             if stat.S_ISREG(fstat.st_mode):
@@ -143,19 +162,25 @@ class FileInfo:
         may send a true value to the generator to skip descending into the
         directory.  For other file types, any value sent to the generator
         will have no effect.
+
+        User and group names are looked up only once per walk.
         """
+        return cls._iterpaths(paths, excludes, {})
+
+    @classmethod
+    def _iterpaths(cls, paths, excludes, namecache):
         for p in paths:
             if p in excludes:
                 continue
             try:
-                info = cls(path=p)
+                info = cls(path=p, namecache=namecache)
             except ArchiveInvalidTypeError as e:
                 warnings.warn(ArchiveWarning("%s ignored" % e))
                 continue
             if (yield info):
                 continue
             if info.is_dir():
-                yield from cls.iterpaths(p.iterdir(), excludes)
+                yield from cls._iterpaths(p.iterdir(), excludes, namecache)
 
 
 class Manifest(Sequence):
@@ -164,8 +189,9 @@ class Manifest(Sequence):
 
     def __init__(self, fileobj=None, paths=None, excludes=None,
                  fileinfos=None, tags=None):
+        self._path_index = None
         if fileobj is not None:
-            docs = yaml.safe_load_all(fileobj)
+            docs = yaml_load_all(fileobj)
             self.head = next(docs)
             # Legacy: version 1.0 head did not have Metadata:
             self.head.setdefault("Metadata", [])
@@ -225,24 +251,22 @@ class Manifest(Sequence):
         self.head["Metadata"].append(str(path))
 
     def find(self, path):
-        for fi in self:
-            if fi.path == path:
-                return fi
-        else:
-            return None
+        if self._path_index is None:
+            # Build the lookup table in reverse order, so that the
+            # first item wins in case of duplicate paths.
+            self._path_index = { fi.path: fi for fi in reversed(self) }
+        return self._path_index.get(path)
 
     def write(self, fileobj):
         fileobj.write("%YAML 1.1\n".encode("ascii"))
-        yaml.dump(self.head, stream=fileobj, encoding="ascii", 
-                  default_flow_style=False, explicit_start=True)
-        yaml.dump([ fi.as_dict() for fi in self ],
-                  stream=fileobj, encoding="ascii",
-                  default_flow_style=False, explicit_start=True)
+        yaml_dump(self.head, fileobj)
+        yaml_dump([ fi.as_dict() for fi in self ], fileobj)
 
     def sort(self, *, key=None, reverse=False):
         if key is None:
             key = lambda fi: fi.path
         self.fileinfos.sort(key=key, reverse=reverse)
+        self._path_index = None
 
 
 def _common_checksum(manifest_a, manifest_b):
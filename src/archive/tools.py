@@ -20,6 +20,7 @@ try:
 except ImportError:
     _dateutil_parse = None
 import packaging.version
+import yaml
 
 
 if hasattr(datetime.datetime, 'fromisoformat'):
@@ -49,6 +50,15 @@ else:
         else:
             raise ValueError("Invalid isoformat string: '%s'" % date_string)
 
+try:
+    # Use the LibYAML based loader and dumper if available, they are
+    # considerably faster than the pure Python implementation.
+    _yaml_loader = yaml.CSafeLoader
+    _yaml_dumper = yaml.CSafeDumper
+except AttributeError:
+    _yaml_loader = yaml.SafeLoader
+    _yaml_dumper = yaml.SafeDumper
+
 
 class Version(packaging.version.Version):
     """A variant of packaging.version.Version.
@@ -157,13 +167,47 @@ def parse_date(date_string):
                                      % date_string) from None
 
 
+def yaml_load_all(stream):
+    """Parse all YAML documents in a stream.
+
+    This is equivalent to yaml.safe_load_all(), but uses the LibYAML
+    based loader if available.
+    """
+    data = stream.read()
+    if _yaml_loader is not yaml.SafeLoader:
+        try:
+            return iter(list(yaml.load_all(data, Loader=_yaml_loader)))
+        except yaml.YAMLError:
+            # LibYAML rejects some input that the pure Python
+            # implementation accepts, such as escaped surrogates that
+            # represent file names not being valid UTF-8.
+            pass
+    return yaml.load_all(data, Loader=yaml.SafeLoader)
+
+
+def yaml_dump(data, stream):
+    """Write data as a YAML document to a binary stream.
+
+    The document is ASCII encoded in block style with an explicit
+    document start marker.
+    """
+    kwargs = dict(encoding="ascii",
+                  default_flow_style=False, explicit_start=True)
+    try:
+        doc = yaml.dump(data, Dumper=_yaml_dumper, **kwargs)
+    except UnicodeEncodeError:
+        # LibYAML fails on surrogates, see yaml_load_all().
+        doc = yaml.dump(data, Dumper=yaml.SafeDumper, **kwargs)
+    stream.write(doc)
+
+
 def checksum(fileobj, hashalg):
     """Calculate hashes for a file.
     """
     if not hashalg:
         return {}
     m = { h:hashlib.new(h) for h in hashalg }
-    chunksize = 8192
+    chunksize = 65536
     while True:
         chunk = fileobj.read(chunksize)
         if not chunk:
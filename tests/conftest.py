@@ -1,15 +1,17 @@
 """pytest configuration.
 """
 
+from contextlib import redirect_stdout, redirect_stderr
 import datetime
 import hashlib
+import importlib
 import os
 from pathlib import Path
-from random import getrandbits
 import shutil
 import subprocess
 import sys
 import tempfile
+import warnings
 import pytest
 import archive
 from archive.tools import ft_mode
@@ -18,7 +20,8 @@ from archive.tools import ft_mode
 __all__ = [
     'FrozenDateTime', 'FrozenDate', 'MockFunction',
     'DataDir', 'DataFile', 'DataContentFile', 'DataRandomFile', 'DataSymLink',
-    'absflag', 'archive_name', 'callscript',  'check_manifest',
+    'absflag', 'archive_name', 'callscript', 'callscript_inproc',
+    'check_manifest',
     'get_output', 'gettestdata', 'require_compression', 'setup_testdata',
     'sub_testdata',
 ]
@@ -33,6 +36,15 @@ def pytest_addoption(parser):
 def pytest_configure(config):
     global _cleanup
     _cleanup = not config.getoption("--no-cleanup")
+    # Tests within a module or a class may depend on each other.  If
+    # the tests are distributed using pytest-xdist, make sure these
+    # are run in the same worker, unless the distribution mode has
+    # explicitly been set on the command line.
+    if config.pluginmanager.hasplugin("xdist"):
+        dist_set = any(a == "--dist" or a.startswith("--dist=")
+                       for a in config.invocation_params.args)
+        if config.getoption("dist") == "load" and not dist_set:
+            config.option.dist = "loadscope"
 
 def require_compression(compression):
     """Check if the library module needed for compression is available.
@@ -90,11 +102,26 @@ class MockFunction:
     def __call__(self, *args):
         return self._value
 
+def _get_tmpdir_base():
+    """Return the directory to create temporary directories in.
+
+    Prefer a RAM based file system if available, unless the location
+    has explicitly been set in the TMPDIR environment variable.
+    """
+    if 'TMPDIR' not in os.environ:
+        shm = Path("/dev/shm")
+        if shm.is_dir() and os.access(str(shm), os.W_OK | os.X_OK):
+            return str(shm)
+    return None
+
+_tmpdir_base = _get_tmpdir_base()
+
 class TmpDir(object):
     """Provide a temporary directory.
     """
     def __init__(self):
-        self.dir = Path(tempfile.mkdtemp(prefix="archive-tools-test-"))
+        self.dir = Path(tempfile.mkdtemp(prefix="archive-tools-test-",
+                                         dir=_tmpdir_base))
     def cleanup(self):
         if self.dir and _cleanup:
             shutil.rmtree(self.dir)
@@ -249,7 +276,7 @@ class DataContentFile(DataFileBase):
 class DataRandomFile(DataContentFile):
 
     def __init__(self, path, mode, *, mtime=None, size=1024):
-        data = bytearray(getrandbits(8) for _ in range(size))
+        data = os.urandom(size)
         super().__init__(path, data, mode, mtime=mtime)
 
 class DataSymLink(DataItem):
@@ -323,6 +350,39 @@ def callscript(scriptname, args, returncode=0,
     retcode = subprocess.call(cmd, stdin=stdin, stdout=stdout, stderr=stderr)
     assert retcode == returncode
 
+_script_entry_points = {
+    "archive-tool.py": ("archive.cli", "archive_tool"),
+}
+
+def callscript_inproc(scriptname, args, returncode=0,
+                      stdout=None, stderr=None):
+    """Call the entry point of a script in the running process.
+
+    This avoids the overhead of starting a new Python interpreter as
+    in callscript().  Use callscript() for tests that need the script
+    to run in a separate process.
+    """
+    modname, funcname = _script_entry_points[scriptname]
+    func = getattr(importlib.import_module(modname), funcname)
+    argv = [scriptname] + args
+    print("\n>", *argv)
+    save_argv = sys.argv
+    sys.argv = argv
+    try:
+        # The script may install its own warnings.showwarning.  Make
+        # sure to restore the warnings state afterwards.
+        with warnings.catch_warnings(), \
+             redirect_stdout(stdout or sys.stdout), \
+             redirect_stderr(stderr or sys.stderr):
+            warnings.simplefilter("always")
+            try:
+                retcode = func() or 0
+            except SystemExit as e:
+                retcode = e.code or 0
+    finally:
+        sys.argv = save_argv
+    assert retcode == returncode
+
 def get_output(fileobj):
     while True:
         line = fileobj.readline()
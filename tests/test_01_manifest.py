@@ -2,8 +2,10 @@
 """
 
 import datetime
+from io import BytesIO
 from pathlib import Path
 import pytest
+import yaml
 from archive.manifest import FileInfo, Manifest
 from conftest import *
 
@@ -165,6 +167,53 @@ def test_manifest_sort(test_dir, monkeypatch):
             assert fi.path >= prev.path
         prev = fi
 
+def test_manifest_find(test_dir, monkeypatch):
+    """Test the Manifest.find() method.
+    """
+    monkeypatch.chdir(test_dir)
+    manifest = Manifest(paths=[Path("base")])
+    for item in testdata:
+        fi = manifest.find(item.path)
+        assert fi is not None
+        assert fi.path == item.path
+        assert fi.type == item.type
+    assert manifest.find(Path("base", "nonexistent")) is None
+
+
+def test_manifest_write_read_non_ascii(test_dir, monkeypatch):
+    """Write and read back a manifest having a long non-ASCII path.
+
+    The LibYAML based dumper, if available, folds long escaped
+    strings differently from the pure Python dumper.  The data must
+    load back the same in any case, also with the pure Python loader.
+    And a manifest written by the pure Python dumper must be readable.
+    """
+    monkeypatch.chdir(test_dir)
+    p = Path("\u00e4\u00f6\u00fc-long-name-" * 8 + ".dat")
+    with p.open("wt") as f:
+        print("Some content", file=f)
+    try:
+        manifest = Manifest(paths=[p])
+        data = [ fi.as_dict() for fi in manifest ]
+        with BytesIO() as f:
+            manifest.write(f)
+            doc = f.getvalue()
+        with BytesIO(doc) as f:
+            manifest_read = Manifest(fileobj=f)
+        assert manifest_read.head == manifest.head
+        assert [ fi.as_dict() for fi in manifest_read ] == data
+        assert list(yaml.safe_load_all(doc)) == [manifest.head, data]
+        kwargs = dict(Dumper=yaml.SafeDumper, encoding="ascii",
+                      default_flow_style=False, explicit_start=True)
+        doc = (b"%YAML 1.1\n" + yaml.dump(manifest.head, **kwargs) +
+               yaml.dump(data, **kwargs))
+        with BytesIO(doc) as f:
+            manifest_read = Manifest(fileobj=f)
+        assert manifest_read.head == manifest.head
+        assert [ fi.as_dict() for fi in manifest_read ] == data
+    finally:
+        p.unlink()
+
 
 @pytest.mark.parametrize(("tags", "expected"), [
     (None, ()),
@@ -1,6 +1,7 @@
 """Misc issues around creating an archive.
 """
 
+import os
 from pathlib import Path
 from tempfile import TemporaryFile
 import pytest
@@ -75,6 +76,22 @@ def test_create_sorted(test_dir, monkeypatch):
         for p in files:
             p.unlink()
 
+def test_create_non_utf8_filename(test_dir, monkeypatch):
+    """A file name that is not valid UTF-8.
+    """
+    monkeypatch.chdir(test_dir)
+    archive_path = Path("archive-non-utf8.tar")
+    p = Path(os.fsdecode(b"base/non-utf8-\xff.dat"))
+    with p.open("wt") as f:
+        print("Some content", file=f)
+    try:
+        Archive().create(archive_path, "", [p])
+        with Archive().open(archive_path) as archive:
+            assert [fi.path for fi in archive.manifest] == [p]
+            archive.verify()
+    finally:
+        p.unlink()
+
 def test_create_custom_metadata(test_dir, monkeypatch):
     """Add additional custom metadata to the archive.
     """
@@ -26,7 +26,7 @@ def test_cli_ls_blank_path(tmpdir):
     Archive().create(archive_path, paths=[Path("base")], workdir=tmpdir)
     with TemporaryFile(mode="w+t", dir=tmpdir) as f:
         args = ["ls", str(archive_path)]
-        callscript("archive-tool.py", args, stdout=f)
+        callscript_inproc("archive-tool.py", args, stdout=f)
         f.seek(0)
         for entry in sorted(testdata, key=lambda e: e.path):
             line = f.readline().strip()
@@ -51,7 +51,7 @@ def test_cli_warn_ignore_socket(test_dir, testname, monkeypatch):
     with tmp_socket(fp):
         with TemporaryFile(mode="w+t", dir=test_dir) as f:
             args = ["create", name, "base"]
-            callscript("archive-tool.py", args, stderr=f)
+            callscript_inproc("archive-tool.py", args, stderr=f)
             f.seek(0)
             line = f.readline().strip()
             assert line == ("archive-tool.py: %s: socket ignored" % fp)
@@ -117,5 +117,4 @@ def test_schedule_parse(schedule, dates):
     """Various parsing examples for ScheduleDate.
     """
     sd = ScheduleDate(schedule)
-    for d in dates:
-        assert (d[0] in sd) == d[1]
+    assert [ (dt, dt in sd) for dt, _ in dates ] == dates
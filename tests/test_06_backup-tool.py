@@ -9,7 +9,6 @@ import pwd
 import shutil
 import socket
 import string
-import sys
 from archive import Archive
 from archive.index import IndexItem, ArchiveIndex
 from archive.bt import backup_tool
@@ -60,22 +59,23 @@ class BTTestEnv:
         self._gethostname.set_return_value(name)
 
     def add_test_data(self, tags, items):
+        paths = set()
         for i in items:
             self.test_data[i.path] = i
-            for t in tags:
-                for s in self.schedules:
-                    k = (t,s)
-                    self.test_data_tags.setdefault(k, set())
-                    self.test_data_tags[k].add(i.path)
+            paths.add(i.path)
+        for t in tags:
+            for s in self.schedules:
+                self.test_data_tags.setdefault((t,s), set()).update(paths)
 
     def remove_test_data(self, tags, items):
+        paths = set()
         for i in items:
             del self.test_data[i.path]
-            for t in tags:
-                for s in self.schedules:
-                    k = (t,s)
-                    self.test_data_tags.setdefault(k, set())
-                    self.test_data_tags[k].discard(i.path)
+            paths.add(i.path)
+        for t in tags:
+            for s in self.schedules:
+                tagged = self.test_data_tags.setdefault((t,s), set())
+                tagged.difference_update(paths)
 
     def flush_test_data(self, tags, schedule):
         idx = self.schedules.index(schedule)
@@ -97,13 +97,11 @@ class BTTestEnv:
 
     def check_index(self):
         idx_file = self.backupdir / ".index.yaml"
-        backupdir_content = { idx_file }
         with idx_file.open("rb") as f:
             idx = ArchiveIndex(f)
-        assert len(idx) == len(self.index)
-        for i1, i0 in zip(idx, self.index):
-            assert i1.as_dict() == i0.as_dict()
-            backupdir_content.add(i0.path)
+        assert ([ i.as_dict() for i in idx ] ==
+                [ i.as_dict() for i in self.index ])
+        backupdir_content = { idx_file } | { i.path for i in self.index }
         assert set(self.backupdir.iterdir()) == backupdir_content
         assert set(self.tmptarget.iterdir()) == set()
 
@@ -123,10 +121,7 @@ class BTTestEnv:
         self.index.append(IndexItem(idx_data))
 
     def run_backup_tool(self, argv):
-        self.monkeypatch.setattr(sys, "argv", argv.split())
-        with pytest.raises(SystemExit) as excinfo:
-            backup_tool()
-        assert excinfo.value.code == 0
+        assert backup_tool(argv.split()[1:]) == 0
 
 @pytest.fixture(scope="class")
 def env(tmpdir, request):